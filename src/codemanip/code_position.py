@@ -1,8 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from functools import lru_cache
 
 
-@dataclass
+@dataclass(slots=True)
 class CodePosition:
     """Position of an element in the code"""
 
@@ -15,14 +16,22 @@ class CodePosition:
     @staticmethod
     def from_string(s: str) -> CodePosition:
         """Parses a string like '3:5' which means line 3, column 5"""
-        items = s.split(":")
-        assert len(items) == 2
-        line = int(items[0])
-        column = int(items[1])
+        # CodePosition is mutable: only the parse is cached, and a new instance is returned
+        line, column = _parse_position_string(s)
         r = CodePosition(line, column)
         return r
 
 
+@lru_cache(maxsize=16384)
+def _parse_position_string(s: str) -> tuple[int, int]:
+    """Parses a string like '3:5' into (line, column)"""
+    items = s.split(":")
+    assert len(items) == 2
+    line = int(items[0])
+    column = int(items[1])
+    return line, column
+
+
 @dataclass
 class CodeContextWithCaret:
     """
@@ -6,6 +6,7 @@ import os.path
 import pathlib
 import re
 import traceback
+from functools import lru_cache
 from typing import Any, Optional, TypeVar
 from collections.abc import Iterable, Iterator
 
@@ -225,6 +226,7 @@ def add_item_before_cpp_comment(code: str, item: str) -> str:
     return r
 
 
+@lru_cache(maxsize=4096)
 def to_snake_case(name: str) -> str:
     if "re1" not in to_snake_case.__dict__:
         to_snake_case.re1 = re.compile("(.)([A-Z][a-z]+)")  # type: ignore
@@ -705,8 +707,13 @@ def does_match_regex(regex_str: str, word: str) -> bool:
         return False
     if word is None:
         return False
-    matches = list(re.finditer(regex_str, word, re.MULTILINE))
-    return len(matches) > 0
+    # Stop at the first match, instead of listing all of them
+    return _compiled_multiline_regex(regex_str).search(word) is not None
+
+
+@lru_cache(maxsize=1024)
+def _compiled_multiline_regex(regex_str: str) -> re.Pattern[str]:
+    return re.compile(regex_str, re.MULTILINE)
 
 
 def does_match_regexes(regex_strs: list[str], word: str) -> bool:
@@ -808,20 +815,33 @@ def replace_in_string_remove_line_if_none(input_string: str, replacements: dict[
     r = input_string
 
     for search, replace in replacements.items():
+        full_search = "{" + search + "}"
         if replace is None:
-            lines = r.split("\n")
-            new_lines = []
-            for line in lines:
-                if "{" + search + "}" not in line:
-                    new_lines.append(line)
-            r = "\n".join(new_lines)
+            r = _remove_lines_containing(r, full_search)
         else:
-            full_search = "{" + search + "}"
             r = r.replace(full_search, replace)
 
     return r
 
 
+def _remove_lines_containing(input_string: str, what: str) -> str:
+    """Removes the lines that contain `what`.
+    Same result as filtering input_string.split("\\n"), but only the lines that match are cut out of the string.
+    """
+    r = input_string
+    pos = r.find(what)
+    while pos >= 0:
+        line_start = r.rfind("\n", 0, pos) + 1
+        line_end = r.find("\n", pos)
+        if line_end < 0:
+            # last line: remove it, together with the end of line of the previous line
+            return r[: max(line_start - 1, 0)]
+        # remove the line and its end of line
+        r = r[:line_start] + r[line_end + 1 :]
+        pos = r.find(what, line_start)
+    return r
+
+
 def replace_maybe_comma(code: str, nb_skipped_final_lines: int = 0) -> str:
     """Replace all occurrences of {maybe_comma} by a ',' if it is not on the last line, else by empty."""
     lines = code.split("\n")
@@ -217,3 +217,14 @@ def test_find_word_after_token():
     code = "return_value_policy::reference // Yes"
     r = code_utils.find_word_after_token(code, "return_value_policy::")
     assert r == "reference"
+
+
+def test_replace_in_string_remove_line_if_none():
+    template = "f({a}{maybe_comma}\n  {b}{maybe_comma}\n  {c}\n)\n{b}"
+    r = code_utils.replace_in_string_remove_line_if_none(template, {"a": "x", "b": None, "c": "y"})
+    assert r == "f(x{maybe_comma}\n  y\n)"
+
+    r = code_utils.replace_in_string_remove_line_if_none("{a}\n{a}", {"a": None})
+    assert r == ""
+    r = code_utils.replace_in_string_remove_line_if_none("{a}\nb\n", {"a": None})
+    assert r == "b\n"
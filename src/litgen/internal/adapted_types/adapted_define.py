@@ -35,7 +35,7 @@ def _compute_define_value_type(define_value: str) -> _PreprocessorDefineValueTyp
         except ValueError:
             return _PreprocessorDefineValueType.Other
     else:  # nb_dots == 0 => try to parse int
-        if define_value.startswith("0x") or define_value.startswith("0X"):
+        if define_value.startswith(("0x", "0X")):
             try:
                 _ = int(define_value, 16)
                 return _PreprocessorDefineValueType.Hex
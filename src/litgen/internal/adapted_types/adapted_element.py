@@ -1,4 +1,5 @@
 from __future__ import annotations
+import copy
 from dataclasses import dataclass
 from typing import Any, Optional
 
@@ -16,6 +17,9 @@ _PROGRESS_BAR_TITLE_ADAPTED_ELEMENTS = "litgen:   Create AdaptedElements........
 _PROGRESS_BAR_TITLE_PYDEF = "litgen:   Generate pydef cpp file............ "
 _PROGRESS_BAR_TITLE_STUB = "litgen:   Generate stubs..................... "
 
+# members that are always copied as shallow members (this is intentionally a static list)
+_AdaptedElement__deep_copy_force_shallow_ = ["options", "lg_context"]
+
 
 @dataclass
 class AdaptedElement:  # (abc.ABC):  # Cannot be abstract (mypy limitation:  https://github.com/python/mypy/issues/5374)
@@ -61,6 +65,23 @@ class AdaptedElement:  # (abc.ABC):  # Cannot be abstract (mypy limitation:  htt
             assert self._cpp_element.parent is not None
         global_progress_bars().set_current_line(_PROGRESS_BAR_TITLE_ADAPTED_ELEMENTS, element_line)
 
+    def __deepcopy__(self, memo=None):
+        """AdaptedElement.__deepcopy__: force shallow copy of the options and of the context
+        Reason:
+        - options and context are global during the generation: a copy shall still write into the same context
+        - they are heavy (the options contain many compiled regex replacements)
+          When we deepcopy, we intend to modify only the adapted C++ elements.
+        """
+        cls = self.__class__
+        result = cls.__new__(cls)
+        memo[id(self)] = result  # type: ignore
+        for k, v in self.__dict__.items():
+            if k not in _AdaptedElement__deep_copy_force_shallow_:
+                setattr(result, k, copy.deepcopy(v, memo))
+            else:
+                setattr(result, k, v)
+        return result
+
     #  ============================================================================================
     #
     #    Abstract methods that shall be implemented by derived classes
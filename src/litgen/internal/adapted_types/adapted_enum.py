@@ -52,9 +52,10 @@ class AdaptedEnumDecl(AdaptedDecl):
 
         def remove_case_insensitive_prefix_with_possible_underscore(name: str, prefix: str) -> str:
             r = name
-            if name.upper().startswith(prefix.upper() + "_"):
+            name_upper, prefix_upper = name.upper(), prefix.upper()
+            if name_upper.startswith(prefix_upper + "_"):
                 r = name[len(prefix) + 1 :]
-            elif name.upper().startswith(prefix.upper()):
+            elif name_upper.startswith(prefix_upper):
                 r = name[len(prefix) :]
             return r
 
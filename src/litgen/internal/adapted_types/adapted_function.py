@@ -1,6 +1,7 @@
 from __future__ import annotations
 import copy
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import cast
 
 from munch import Munch  # type: ignore
@@ -25,6 +26,10 @@ from litgen.internal.adapted_types.adapted_element import AdaptedElement
 from litgen.internal.context.litgen_context import LitgenContext
 
 
+# The pydef templates below are constant strings: they are unindented only once
+_unindent_template = lru_cache(maxsize=None)(code_utils.unindent_code)
+
+
 @dataclass
 class AdaptedParameter(AdaptedElement):
     def __init__(self, lg_context: LitgenContext, param: CppParameter) -> None:
@@ -473,21 +478,22 @@ class AdaptedFunction(AdaptedElement):
 
         return lines
 
-    def _pydef_return_str(self) -> str:
+    def _pydef_return_str(self, returns_void: bool) -> str:
         """Creates the return part of the pydef"""
 
         template_code = "{return_or_nothing}{self_prefix}{function_to_call}({params_call_inner})"
 
-        return_or_nothing = "" if self.cpp_adapted_function.returns_void() else "return "
-        self_prefix = "self." if (self.is_method() and self.lambda_to_call is None) else ""
+        function_infos = self.cpp_adapted_function
+        lambda_to_call = self.lambda_to_call
+
+        return_or_nothing = "" if returns_void else "return "
+        self_prefix = "self." if (self.is_method() and lambda_to_call is None) else ""
         # fill function_to_call
         function_to_call = (
-            self.lambda_to_call
-            if self.lambda_to_call is not None
-            else self.cpp_adapted_function.function_name_with_specialization()
+            lambda_to_call if lambda_to_call is not None else function_infos.function_name_with_specialization()
         )
         # Fill params_call_inner
-        params_call_inner = self.cpp_adapted_function.parameter_list.str_names_only_for_call()
+        params_call_inner = function_infos.parameter_list.str_names_only_for_call()
 
         code = code_utils.replace_in_string(
             template_code,
@@ -501,7 +507,7 @@ class AdaptedFunction(AdaptedElement):
         return code
 
     def _pydef_end_arg_docstring_returnpolicy(self) -> str:
-        template_code = code_utils.unindent_code(
+        template_code = _unindent_template(
             """
             {_i_}{maybe_py_arg}{maybe_comma}
             {_i_}{maybe_docstring}{maybe_comma}
@@ -562,7 +568,7 @@ class AdaptedFunction(AdaptedElement):
 
     def _pydef_method_creation_part(self) -> str:
         """Create the first code line of the pydef"""
-        template_code = code_utils.unindent_code(
+        template_code = _unindent_template(
             """
             {module_or_class}.{def_maybe_static}("{function_name_python}",{location}
             """,
@@ -591,7 +597,7 @@ class AdaptedFunction(AdaptedElement):
 
     def _pydef_without_lambda_str_impl(self) -> str:
         """Create the full code of the pydef, with a direct call to the function or method"""
-        template_code = code_utils.unindent_code(
+        template_code = _unindent_template(
             """
             {pydef_method_creation_part}
             {_i_}{function_pointer}{maybe_comma}{pydef_end_arg_docstring_returnpolicy}"""
@@ -669,7 +675,7 @@ class AdaptedFunction(AdaptedElement):
     def _pydef_with_lambda_str_impl(self) -> str:
         """Create the full code of the pydef, with an inner lambda"""
 
-        template_code = code_utils.unindent_code(
+        template_code = _unindent_template(
             """
             {pydef_method_creation_part}
             {_i_}[]({params_call_with_self_if_method}){lambda_return_arrow}
@@ -681,16 +687,19 @@ class AdaptedFunction(AdaptedElement):
         )[1:]
 
         function_infos = self.cpp_adapted_function
+        options = self.options
+        _i_ = options._indent_cpp_spaces()
+        is_constructor = self.is_constructor()
 
         # Standard replacement dict (r) and replacement dict with possible line removal (l)
         replace_tokens = Munch()
         replace_lines = Munch()
 
         # fill _i_
-        replace_tokens._i_ = self.options._indent_cpp_spaces()
+        replace_tokens._i_ = _i_
 
-        if self.is_constructor():
-            if self.options.bind_library == BindLibraryType.pybind11:
+        if is_constructor:
+            if options.bind_library == BindLibraryType.pybind11:
                 replace_tokens.pydef_method_creation_part = ".def(py::init("
                 replace_tokens.maybe_close_paren_if_ctor = ")"
             else:
@@ -702,7 +711,7 @@ class AdaptedFunction(AdaptedElement):
 
         # fill params_call_with_self_if_method
         _params_list = function_infos.parameter_list.list_types_names_default_for_signature()
-        if self.is_method() and not self.is_constructor():
+        if self.is_method() and not is_constructor:
             _self_param = f"{self._pydef_str_parent_cpp_scope()} & self"
             if function_infos.is_const():
                 _self_param = "const " + _self_param
@@ -710,14 +719,16 @@ class AdaptedFunction(AdaptedElement):
         replace_tokens.params_call_with_self_if_method = ", ".join(_params_list)
 
         # Fill lambda_return_arrow
-        if self.cpp_adapted_function.returns_void():
+        # (the return type is computed once: returns_void() would compute it again)
+        full_return_type = function_infos.str_full_return_type()
+        returns_void = full_return_type == "void"
+        if returns_void:
             replace_tokens.lambda_return_arrow = ""
         else:
-            full_return_type = self.cpp_adapted_function.str_full_return_type()
             replace_tokens.lambda_return_arrow = f" -> {full_return_type}"
 
         # fill return_code
-        replace_tokens.return_code = self._pydef_return_str()
+        replace_tokens.return_code = self._pydef_return_str(returns_void)
 
         # fill lambda_adapter_code
         replace_lines.lambda_adapter_code = self.cpp_adapter_code
@@ -725,7 +736,7 @@ class AdaptedFunction(AdaptedElement):
         if replace_lines.lambda_adapter_code is not None:
             replace_lines.lambda_adapter_code = code_utils.indent_code(
                 replace_lines.lambda_adapter_code,
-                indent_str=self.options._indent_cpp_spaces() * 2,
+                indent_str=_i_ * 2,
                 skip_first_line=True,
             )
             if replace_lines.lambda_adapter_code[-1] == "\n":
@@ -760,7 +771,7 @@ class AdaptedFunction(AdaptedElement):
             DOC_STRING);
         """
 
-        template_code = code_utils.unindent_code(
+        template_code = _unindent_template(
             """
             .def({py}::init<{arg_types}>(){maybe_comma}{location}
             {_i_}{maybe_pyarg}{maybe_comma}
@@ -777,13 +788,15 @@ class AdaptedFunction(AdaptedElement):
         arg_types = function_infos.parameter_list.str_types_only_for_overload()
         location = self._elm_info_original_location_cpp()
 
-        if len(self._pydef_pyarg_list()) > 0:
-            maybe_pyarg = ", ".join(self._pydef_pyarg_list())
+        pyarg_codes = self._pydef_pyarg_list()
+        if len(pyarg_codes) > 0:
+            maybe_pyarg = ", ".join(pyarg_codes)
         else:
             maybe_pyarg = None
 
-        if len(self._elm_comment_pydef_one_line()) > 0:
-            maybe_docstring = f'"{self._elm_comment_pydef_one_line()}"'
+        comment = self._elm_comment_pydef_one_line()
+        if len(comment) > 0:
+            maybe_docstring = f'"{comment}"'
         else:
             maybe_docstring = None
 
@@ -873,19 +886,20 @@ class AdaptedFunction(AdaptedElement):
         else:
             return param
 
+    def _skip_first_self_arg(self) -> bool:
+        """For nanobind, the first "self" argument of constructors is skipped"""
+        return self.options.bind_library == BindLibraryType.nanobind and self.is_constructor()
+
     def _pydef_pyarg_list(self) -> list[str]:
+        lg_context = self.lg_context
+        skip_first_self_arg = self._skip_first_self_arg()
         pyarg_strs: list[str] = []
         for i, param in enumerate(self.cpp_adapted_function.parameter_list.parameters):
-            # For nanobind, skip first "self" argument in constructors
-            is_nanobind = self.options.bind_library == BindLibraryType.nanobind
-            if is_nanobind:
-                is_ctor = self.is_constructor()
-                is_first_self_arg = i == 0 and param.decl.decl_name == "self"
-                if is_ctor and is_first_self_arg:
-                    continue
+            if skip_first_self_arg and i == 0 and param.decl.decl_name == "self":
+                continue
 
             param = self._pydef_adapt_param_if_using_inner_class(param)
-            adapted_decl = AdaptedDecl(self.lg_context, param.decl)
+            adapted_decl = AdaptedDecl(lg_context, param.decl)
 
             # Skip *args and **kwarg
             param_type_cpp = adapted_decl.cpp_element().cpp_type.str_code()
@@ -895,7 +909,7 @@ class AdaptedFunction(AdaptedElement):
                 .replace(" &", "")
                 .replace("nanobind::", "py::")
             )
-            if param_type_cpp_simplified in ["py::args", "py::kwargs", "py::args", "py::kwargs"]:
+            if param_type_cpp_simplified in ("py::args", "py::kwargs"):
                 continue
 
             pyarg_str = adapted_decl._str_pydef_as_pyarg()
@@ -948,12 +962,11 @@ class AdaptedFunction(AdaptedElement):
 
     def _pydef_fill_call_policy_from_function_comment(self, call_policy_token: str) -> str | None:
         function_comment = self.cpp_element().cpp_element_comments.comments_as_str()
-        if call_policy_token in function_comment:
-            idx = function_comment.index(call_policy_token)
-            comment_rest = function_comment[idx:]
-            if "()" in comment_rest:
-                idx2 = comment_rest.index("()")
-                keep_alive_code = comment_rest[: idx2 + 2]
+        _, token_found, comment_rest = function_comment.partition(call_policy_token)
+        if token_found:
+            call_policy_args, paren_found, _ = comment_rest.partition("()")
+            if paren_found:
+                keep_alive_code = call_policy_token + call_policy_args + "()"
                 return keep_alive_code
         return None
 
@@ -967,14 +980,13 @@ class AdaptedFunction(AdaptedElement):
         return s
 
     def _pydef_fill_keep_alive_from_function_comment(self) -> str | None:
-        v_py = self._pydef_fill_call_policy_from_function_comment("py::keep_alive")
-        v_nb = self._pydef_fill_call_policy_from_function_comment("py::keep_alive")
-        return self._replace_py_or_nb_namespace(v_py or v_nb)
+        # (the token is "py::" for both pybind11 and nanobind)
+        v = self._pydef_fill_call_policy_from_function_comment("py::keep_alive")
+        return self._replace_py_or_nb_namespace(v)
 
     def _pydef_fill_call_guard_from_function_comment(self) -> str | None:
-        v_py = self._pydef_fill_call_policy_from_function_comment("py::call_guard")
-        v_nb = self._pydef_fill_call_policy_from_function_comment("py::call_guard")
-        return self._replace_py_or_nb_namespace(v_py or v_nb)
+        v = self._pydef_fill_call_policy_from_function_comment("py::call_guard")
+        return self._replace_py_or_nb_namespace(v)
 
     def _pydef_str_parent_cpp_scope(self) -> str:
         if self.is_method():
@@ -1068,27 +1080,31 @@ class AdaptedFunction(AdaptedElement):
         params_strs = self._stub_params_list_signature()
 
         # Try to add function decl + all params and return type on the same line
+        # (its length is computed first, so that the line is built only if it fits)
         def function_name_and_params_on_one_line() -> str | None:
-            first_code_line_full = function_def_code
-            first_code_line_full += ", ".join(params_strs)
-            first_code_line_full += return_code
-            first_code_line_full += comment_python_type_ignore + comment_python_overridable
-            if (
-                self.options.python_max_line_length <= 0
-                or len(first_code_line_full) < self.options.python_max_line_length
-            ):
-                return first_code_line_full
-            else:
-                return None
+            python_max_line_length = self.options.python_max_line_length
+            if python_max_line_length > 0:
+                first_code_line_length = (
+                    len(function_def_code)
+                    + sum(len(param_str) for param_str in params_strs)
+                    + 2 * max(len(params_strs) - 1, 0)
+                    + len(return_code)
+                    + len(comment_python_type_ignore)
+                    + len(comment_python_overridable)
+                )
+                if first_code_line_length >= python_max_line_length:
+                    return None
+            return (
+                function_def_code
+                + ", ".join(params_strs)
+                + return_code
+                + comment_python_type_ignore
+                + comment_python_overridable
+            )
 
         # Else put params one by line
         def function_name_and_params_line_by_line() -> list[str]:
-            params_strs_comma = []
-            for i, param_str in enumerate(params_strs):
-                if i < len(params_strs) - 1:
-                    params_strs_comma.append(param_str + ", ")
-                else:
-                    params_strs_comma.append(param_str)
+            params_strs_comma = [param_str + ", " for param_str in params_strs[:-1]] + params_strs[-1:]
             lines = (
                 [function_def_code + comment_python_type_ignore + comment_python_overridable]
                 + params_strs_comma
@@ -1102,8 +1118,9 @@ class AdaptedFunction(AdaptedElement):
 
         # Add staticmethod or overload decorator
         decorators = []
+        shall_vectorize = self.shall_vectorize()
         vectorize_needs_overload = (
-            (self.is_vectorize_impl or self.shall_vectorize())
+            (self.is_vectorize_impl or shall_vectorize)
             and self.options.fn_vectorize_prefix == ""
             and self.options.fn_vectorize_suffix == ""
         )
@@ -1125,7 +1142,7 @@ class AdaptedFunction(AdaptedElement):
 
         r = self._elm_stub_original_code_lines_info() + r
 
-        if self.shall_vectorize():
+        if shall_vectorize:
             new_vectorized_function = copy.copy(self)
             new_vectorized_function.is_vectorize_impl = True
             r += new_vectorized_function.stub_lines()
@@ -1230,19 +1247,16 @@ class AdaptedFunction(AdaptedElement):
         cpp_adapted_function_terse = self.cpp_adapted_function.with_terse_types(current_scope=current_scope)
         cpp_parameters = cpp_adapted_function_terse.parameter_list.parameters
 
+        options, lg_context = self.options, self.lg_context
+        skip_first_self_arg = self._skip_first_self_arg()
         r = []
         for i, param in enumerate(cpp_parameters):
-            # For nanobind, skip first "self" argument in constructors
-            is_nanobind = self.options.bind_library == BindLibraryType.nanobind
-            if is_nanobind:
-                is_ctor = self.is_constructor()
-                is_first_self_arg = i == 0 and param.decl.decl_name == "self"
-                if is_ctor and is_first_self_arg:
-                    continue
+            if skip_first_self_arg and i == 0 and param.decl.decl_name == "self":
+                continue
 
             param_decl = param.decl
 
-            param_name_python = cpp_to_python.var_name_to_python(self.options, param_decl.decl_name)
+            param_name_python = cpp_to_python.var_name_to_python(options, param_decl.decl_name)
             param_type_cpp = param_decl.cpp_type.str_code()
 
             # Handle *args and **kwargs
@@ -1253,15 +1267,15 @@ class AdaptedFunction(AdaptedElement):
                     .replace(" &", "")
                     .replace("nanobind::", "py::")
                 )
-                if param_type_cpp_simplified == "py::args" or param_type_cpp_simplified == "py::args":
+                if param_type_cpp_simplified == "py::args":
                     r.append("*args")
                     continue
-                if param_type_cpp_simplified == "py::kwargs" or param_type_cpp_simplified == "py::kwargs":
+                if param_type_cpp_simplified == "py::kwargs":
                     r.append("**kwargs")
                     continue
 
-            param_type_cpp = self.options.fn_params_type_replacements.apply(param_type_cpp)
-            param_type_python = cpp_to_python.type_to_python(self.lg_context, param_type_cpp)
+            param_type_cpp = options.fn_params_type_replacements.apply(param_type_cpp)
+            param_type_python = cpp_to_python.type_to_python(lg_context, param_type_cpp)
             # Add Optional to param_type_python if cpp_type is a pointer with default = nullptr or NULL
             if "*" in param_decl.cpp_type.modifiers and param_decl.initial_value_code in ["NULL", "nullptr"]:
                 param_type_python = f"Optional[{param_type_python}]"
@@ -1274,13 +1288,12 @@ class AdaptedFunction(AdaptedElement):
             if initial_value_code.strip().startswith("{") and initial_value_code.endswith("}"):
                 # Special case for initial value with brace init
                 initial_value_code = param_decl.cpp_type.typenames[0] + "(" + initial_value_code[1:-1] + ")"
-            param_default_value = cpp_to_python.var_value_to_python(self.lg_context, initial_value_code)
+            param_default_value = cpp_to_python.var_value_to_python(lg_context, initial_value_code)
 
-            param_code = f"{param_name_python}: {param_type_python}"
             if len(param_default_value) > 0:
-                param_code += f" = {param_default_value}"
-
-            r.append(param_code)
+                r.append(f"{param_name_python}: {param_type_python} = {param_default_value}")
+            else:
+                r.append(f"{param_name_python}: {param_type_python}")
 
         if self.is_method() and not self.cpp_adapted_function.is_static_method():
             r = ["self"] + r
@@ -1372,7 +1385,7 @@ class AdaptedFunction(AdaptedElement):
         assert self.cpp_element().is_virtual_method()
 
         if self.options.bind_library == BindLibraryType.pybind11:
-            template_code = code_utils.unindent_code(
+            template_code = _unindent_template(
                 """
             {return_type} {function_name_cpp}({param_list}){maybe_const} override
             {
@@ -1388,7 +1401,7 @@ class AdaptedFunction(AdaptedElement):
                 flag_strip_empty_lines=True,
             )
         else:
-            template_code = code_utils.unindent_code(
+            template_code = _unindent_template(
                 """
             {return_type} {function_name_cpp}({param_list}){maybe_const} override
             {
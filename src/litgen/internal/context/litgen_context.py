@@ -28,6 +28,8 @@ class LitgenContext:
     namespaces_stub: NamespacesCodeTree
     namespaces_pydef: NamespacesCodeTree
     var_values_replacements_cache: ReplacementsCache
+    # cache for cpp_to_python.type_to_python (cpp type -> python type, before the namespaces translation)
+    type_to_python_cache: dict[str, str]
 
     # cf https://pybind11.readthedocs.io/en/stable/advanced/classes.html#binding-protected-member-functions
     protected_methods_glue_code: str = ""
@@ -43,6 +45,7 @@ class LitgenContext:
         self.namespaces_stub = NamespacesCodeTree(self.options, PydefOrStub.Stub)
         self.namespaces_pydef = NamespacesCodeTree(self.options, PydefOrStub.Pydef)
         self.var_values_replacements_cache = ReplacementsCache()
+        self.type_to_python_cache = {}
 
     def clear_namespaces_code_tree(self) -> None:
         self.namespaces_stub = NamespacesCodeTree(self.options, PydefOrStub.Stub)
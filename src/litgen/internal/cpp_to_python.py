@@ -1,5 +1,6 @@
 from __future__ import annotations
 import keyword
+import re
 from dataclasses import dataclass  # noqa
 from typing import Optional
 
@@ -121,8 +122,11 @@ def _perform_cpp_type_replacements_recursively(cpp_type_str: str, type_replaceme
     return r
 
 
-def type_to_python(lg_context: LitgenContext, cpp_type_str: str) -> str:
-    options = lg_context.options
+_WHITESPACE_REGEX = re.compile(r"\s+")
+
+
+def _type_to_python_without_namespaces(options: LitgenOptions, cpp_type_str: str) -> str:
+    """The part of type_to_python that depends only on the options"""
     specialized_type_python_name = options.class_template_options.specialized_type_python_name_str(
         cpp_type_str, options.type_replacements
     )
@@ -137,17 +141,23 @@ def type_to_python(lg_context: LitgenContext, cpp_type_str: str) -> str:
 
     r = r.replace("::", ".")
 
-    def normalize_whitespace(s: str) -> str:
-        import re
-
-        return re.sub(r"\s+", " ", s).strip()
-
-    r = normalize_whitespace(r)
+    r = _WHITESPACE_REGEX.sub(" ", r).strip()
 
     # Fix for std::optional (issue origin unknown)
     r = r.replace("Optional[" + " ", "Optional[")
+    return r
 
-    # Translate known namespaces
+
+def type_to_python(lg_context: LitgenContext, cpp_type_str: str) -> str:
+    options = lg_context.options
+    # Cache the translation (the options do not change during a run)
+    type_cache = lg_context.type_to_python_cache
+    r = type_cache.get(cpp_type_str)
+    if r is None:
+        r = _type_to_python_without_namespaces(options, cpp_type_str)
+        type_cache[cpp_type_str] = r
+
+    # Translate known namespaces (they are discovered during the generation, and thus not cached)
     for cpp_namespace_name in lg_context.unqualified_stub_namespaces():
         python_namespace_name = namespace_name_to_python(options, cpp_namespace_name)
         if python_namespace_name != cpp_namespace_name:
@@ -159,7 +169,7 @@ def type_to_python(lg_context: LitgenContext, cpp_type_str: str) -> str:
 
 
 def add_underscore_if_python_reserved_word(name: str) -> str:
-    if name in keyword.kwlist:
+    if keyword.iskeyword(name):
         name += "_"
     return name
 
@@ -36,3 +36,14 @@ def test_c_array_fixed_size_to_std_array():
     assert len(new_decls) == 2
     code_utils.assert_are_codes_equal(str(new_decls[0].cpp_element()), "BoxedInt & v_0")
     code_utils.assert_are_codes_equal(str(new_decls[1].cpp_element()), "BoxedInt & v_1")
+
+
+def test_deepcopy_shares_options_and_context():
+    import copy
+
+    options = litgen.LitgenOptions()
+    adapted_decl = to_adapted_decl("int v[2]", options)
+    adapted_decl_copy = copy.deepcopy(adapted_decl)
+    assert adapted_decl_copy.options is adapted_decl.options
+    assert adapted_decl_copy.lg_context is adapted_decl.lg_context
+    assert adapted_decl_copy.cpp_element() is not adapted_decl.cpp_element()
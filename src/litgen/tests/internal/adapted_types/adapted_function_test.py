@@ -731,3 +731,12 @@ def test_change_decl_stmt_to_function_decl_if_suspicious():
     generated_code = litgen.generate_code(options, code)
     # print(generated_code.stub_code)
     code_utils.assert_are_codes_equal(generated_code.stub_code, "")
+
+
+def test_pydef_lines_keep_unicode_line_separators():
+    # The pydef code is split on "\n" only: a unicode line separator inside a docstring
+    # must not be turned into a new line (as str.splitlines() would do)
+    code = "// A comment\u2028with a line separator\nvoid f(int a);\n"
+    options = litgen.LitgenOptions()
+    generated_code = litgen.generate_code(options, code)
+    assert '"A comment\u2028with a line separator"' in generated_code.pydef_code
@@ -72,6 +72,9 @@ from srcmlcpp.srcml_wrapper import SrcmlWrapper
 # code_to_cpp_unit is the main entry. It will transform code into a tree of Cpp elements
 from srcmlcpp.srcmlcpp_main import code_to_cpp_unit
 
+# files_to_cpp_units parses several files in parallel (one CppUnit per file)
+from srcmlcpp.srcmlcpp_main import files_to_cpp_units
+
 # code_to_srcml_xml_wrapper is a lower level utility, that returns a wrapped version of the srcML tree
 from srcmlcpp.srcmlcpp_main import code_to_srcml_wrapper, code_to_cpp_type
 
@@ -80,6 +83,7 @@ from srcmlcpp.scrml_warning_settings import WarningType
 __all__ = [
     # Functions
     "code_to_cpp_unit",
+    "files_to_cpp_units",
     "code_to_cpp_type",
     "code_to_srcml_wrapper",
     "SrcmlcppOptions",
@@ -3,7 +3,7 @@ import copy
 from enum import Enum
 from typing import TYPE_CHECKING, Callable
 
-from srcmlcpp.cpp_types.scope.cpp_scope import CppScope, CppScopePart, CppScopeType
+from srcmlcpp.cpp_types.scope.cpp_scope import CppScope, CppScopePart
 from srcmlcpp.srcml_wrapper import SrcmlWrapper
 
 
@@ -96,17 +96,8 @@ class CppElement(SrcmlWrapper):
         return r
 
     def self_scope(self) -> CppScopePart | None:
-        from srcmlcpp.cpp_types.classes.cpp_struct import CppStruct
-        from srcmlcpp.cpp_types.cpp_namespace import CppNamespace
-        from srcmlcpp.cpp_types.cpp_enum import CppEnum
-
-        if isinstance(self, CppStruct):  # this also tests for CppClass
-            return CppScopePart(CppScopeType.ClassOrStruct, self.class_name)
-        elif isinstance(self, CppNamespace):
-            return CppScopePart(CppScopeType.Namespace, self.ns_name)
-        elif isinstance(self, CppEnum):
-            return CppScopePart(CppScopeType.Enum, self.enum_name)
-
+        """The scope part added by this element (None, except for CppStruct, CppNamespace and CppEnum,
+        which override this method)"""
         return None
 
     def _clear_scope_cache(self) -> None:
@@ -19,6 +19,7 @@ from srcmlcpp.cpp_types.blocks import (
     CppUnit,
 )
 from srcmlcpp.cpp_types.classes.cpp_super_list import CppSuperList
+from srcmlcpp.cpp_types.scope.cpp_scope import CppScopePart, CppScopeType
 from srcmlcpp.cpp_types.decls_types import CppDecl, CppDeclStatement
 from srcmlcpp.cpp_types.functions import CppFunctionDecl
 from srcmlcpp.cpp_types.template.cpp_i_template_host import CppITemplateHost
@@ -99,6 +100,9 @@ class CppStruct(CppElementAndComment, CppITemplateHost):
         r = "struct " + self.class_name
         return r
 
+    def self_scope(self) -> CppScopePart:
+        return CppScopePart(CppScopeType.ClassOrStruct, self.class_name)
+
     def is_final(self) -> bool:
         return self.specifier == "final"
 
@@ -14,6 +14,7 @@ from srcmlcpp.cpp_types.base import (
 from srcmlcpp.scrml_warning_settings import WarningType
 from srcmlcpp.cpp_types.blocks.cpp_block import CppBlock
 from srcmlcpp.cpp_types.decls_types.cpp_decl import CppDecl
+from srcmlcpp.cpp_types.scope.cpp_scope import CppScopePart, CppScopeType
 from srcmlcpp.srcml_wrapper import SrcmlWrapper
 
 
@@ -71,6 +72,9 @@ class CppEnum(CppElementAndComment):
         r += self.enum_name
         return r
 
+    def self_scope(self) -> CppScopePart:
+        return CppScopePart(CppScopeType.Enum, self.enum_name)
+
     def get_enum_decls(self) -> list[CppDecl]:
         r: list[CppDecl] = []
         for child in self.block.block_children:
@@ -6,6 +6,7 @@ from codemanip import code_utils
 from srcmlcpp.cpp_types.base import CppElementAndComment, CppElementsVisitorFunction, CppElementsVisitorEvent
 from srcmlcpp.cpp_types.base.cpp_element_comments import CppElementComments
 from srcmlcpp.cpp_types.blocks.cpp_block import CppBlock
+from srcmlcpp.cpp_types.scope.cpp_scope import CppScopePart, CppScopeType
 from srcmlcpp.srcml_wrapper import SrcmlWrapper
 
 
@@ -47,6 +48,9 @@ class CppNamespace(CppElementAndComment):
     def __repr__(self):
         return f"namespace {self.ns_name}"
 
+    def self_scope(self) -> CppScopePart:
+        return CppScopePart(CppScopeType.Namespace, self.ns_name)
+
     def visit_cpp_breadth_first(self, cpp_visitor_function: CppElementsVisitorFunction, depth: int = 0) -> None:
         cpp_visitor_function(self, CppElementsVisitorEvent.OnElement, depth)
         cpp_visitor_function(self, CppElementsVisitorEvent.OnBeforeChildren, depth)
@@ -12,7 +12,7 @@ class CppScopeType(Enum):
     _Unknown = "_Unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class CppScopePart:
     scope_type: CppScopeType
     scope_name: str
@@ -6,12 +6,11 @@ from __future__ import annotations
 import sys
 
 # mypy: warn_unused_ignores=False
-from typing import Optional
+from typing import Optional, TypeVar, cast
 import logging
-import os
-import random
+import re
+import shutil
 import subprocess
-import tempfile
 import time
 from xml.etree import ElementTree as ET
 
@@ -27,6 +26,15 @@ except ImportError:
 # Count the total time used by call to the exe srcml
 _FLAG_PROFILE_SRCML_CALLS: bool = True
 
+ET.register_namespace("pos", "http://www.srcML.org/srcML/position")
+ET.register_namespace("", "http://www.srcML.org/srcML/src")
+
+# Max number of results kept by each of the srcml calls caches (see _SrcmlCaller)
+_SRCML_CACHE_MAX_SIZE = 4096
+# Only the calls whose input (code or xml) is below this length are cached: whole headers are converted only once,
+# and their xml (several times the size of the code) would stay in memory
+_SRCML_CACHE_MAX_INPUT_LENGTH = 2048
+
 
 def _embed_element_into_unit(element: ET.Element) -> ET.Element:
     if element.tag.endswith("unit"):
@@ -37,37 +45,90 @@ def _embed_element_into_unit(element: ET.Element) -> ET.Element:
         return new_element
 
 
+def _unit_xml_bytes(element: ET.Element) -> bytes:
+    """The xml bytes sent to srcml in order to convert an element back to code"""
+    xml_bytes: bytes = ET.tostring(_embed_element_into_unit(element), encoding="utf8", method="xml")
+    return xml_bytes
+
+
+# Sentinel comments used to separate the elements when calling srcml_to_code_batch
+_BATCH_SLOT_SENTINEL_FORMAT = "/*__SRCML_SLOT_{}__*/"
+_BATCH_SLOT_SENTINEL_REGEX = re.compile(r"/\*__SRCML_SLOT_\d+__\*/")
+
+
+def _element_namespace_prefix(element: ET.Element) -> str:
+    """Returns the namespace part of the element tag (e.g. "{http://www.srcML.org/srcML}"), or ""."""
+    if element.tag.startswith("{"):
+        return element.tag[: element.tag.index("}") + 1]
+    return ""
+
+
 class _TimeStats:
     nb_calls: int = 0
-    total_time: float = 0.0
-    _last_start_time: float = 0.0
+    total_time_ns: int = 0
+    _last_start_time_ns: int = 0
 
     def start(self) -> None:
         self.nb_calls += 1
-        self._last_start_time = time.time()
+        self._last_start_time_ns = time.perf_counter_ns()
 
     def stop(self) -> None:
-        self.total_time += time.time() - self._last_start_time
+        self.total_time_ns += time.perf_counter_ns() - self._last_start_time_ns
+
+    def total_time(self) -> float:
+        """Total time in seconds"""
+        return self.total_time_ns / 1e9
 
     def stats_string(self) -> str:
         if self.nb_calls == 0:
             return ""
-        return f"calls: {self.nb_calls} total time: {self.total_time:.3f}s average: {self.total_time / self.nb_calls * 1000:.0f}ms"
+        return f"calls: {self.nb_calls} total time: {self.total_time():.3f}s average: {self.total_time() / self.nb_calls * 1000:.0f}ms"
+
+
+_CacheKey = TypeVar("_CacheKey")
+_CacheValue = TypeVar("_CacheValue")
+
+
+def _store_in_bounded_cache(
+    cache: dict[_CacheKey, _CacheValue], key: _CacheKey, value: _CacheValue, input_length: int
+) -> None:
+    if input_length > _SRCML_CACHE_MAX_INPUT_LENGTH:
+        return
+    if len(cache) >= _SRCML_CACHE_MAX_SIZE:
+        # dicts are ordered: remove the oldest entry
+        del cache[next(iter(cache))]
+    cache[key] = value
 
 
 class _SrcmlCaller:
     _stats_code_to_srcml: _TimeStats = _TimeStats()
     _stats_srcml_to_code: _TimeStats = _TimeStats()
 
-    def _call_subprocess(self, encoding: str, input_filename: str, output_filename: str, dump_positions: bool) -> None:
-        position_arg = "--position" if dump_positions else ""
+    # Caches for the results of srcml calls (bounded by _SRCML_CACHE_MAX_SIZE and _SRCML_CACHE_MAX_INPUT_LENGTH).
+    # code_to_srcml caches the xml string (not the element), so that each caller receives a fresh element tree.
+    _cache_code_to_srcml: dict[tuple[str, str, bool], str | bytes] = {}
+    _cache_srcml_to_code: dict[tuple[str, bytes], str] = {}
+
+    # Full path of the srcml executable, searched once in the PATH (instead of once per call)
+    _srcml_executable: Optional[str] = None
 
-        shell_command = f"srcml -l C++ {input_filename} {position_arg} --xml-encoding {encoding} --src-encoding {encoding} -o {output_filename}"
-        logging.debug(f"_SrcmlCaller.call: {shell_command}")
+    def _srcml_executable_path(self) -> str:
+        if _SrcmlCaller._srcml_executable is None:
+            _SrcmlCaller._srcml_executable = shutil.which("srcml") or "srcml"
+        return _SrcmlCaller._srcml_executable
+
+    def _call_subprocess(self, args: list[str], input_bytes: bytes) -> bytes:
+        """Runs srcml with the given arguments: the input is sent via stdin, and the output is read from stdout"""
+        logging.debug(f"_SrcmlCaller.call: {' '.join(args)}")
         try:
-            subprocess.check_call(shell_command, shell=True)
-        except subprocess.CalledProcessError as e:
+            completed_process = subprocess.run(
+                args, input=input_bytes, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
             logging.error(f"_SrcmlCaller.call, error {e}")
+            stderr_bytes = getattr(e, "stderr", None)
+            if stderr_bytes:
+                logging.error(f"_SrcmlCaller.call, srcml stderr:\n{stderr_bytes.decode(errors='replace')}")
             logging.error(
                 """
             srcmlcpp requires the installation of srcML ( https://www.srcml.org )
@@ -78,51 +139,23 @@ class _SrcmlCaller:
             """
             )
             sys.exit(1)
+        if completed_process.stderr:
+            logging.warning(f"_SrcmlCaller.call, srcml stderr:\n{completed_process.stderr.decode(errors='replace')}")
+        return completed_process.stdout
 
-    def _random_filename(self) -> str:
-        characters = "abcdefghijklmnopqrstuvwxyz0123456789_"
-        r = "".join(random.choices(characters, k=14))
-        r = tempfile.gettempdir() + "/" + r
-        return r
-
-    def _make_xml_str_by_subprocess(self, encoding: str, input_str: str, dump_positions: bool = False) -> str:
-        input_header_filename = self._random_filename() + ".h"
-        output_xml_filename = self._random_filename() + ".xml"
-
-        with open(input_header_filename, "wb") as input_header_file:
-            input_header_file.write(input_str.encode(encoding))
-            input_header_file.close()
-
-        self._call_subprocess(
-            encoding,
-            input_header_filename,
-            output_xml_filename,
-            dump_positions,
-        )
-
-        with open(output_xml_filename, "rb") as output_xml_file:
-            output_bytes = output_xml_file.read()
-            output_xml_file.close()
+    def _make_xml_bytes_by_subprocess(self, encoding: str, input_str: str, dump_positions: bool = False) -> bytes:
+        args = [self._srcml_executable_path(), "-l", "C++", "--xml-encoding", encoding, "--src-encoding", encoding]
+        if dump_positions:
+            args.append("--position")
+        args.append("-")
 
-        os.remove(input_header_file.name)
-        os.remove(output_xml_file.name)
-        output_str = output_bytes.decode(encoding)
-        return output_str
+        # the xml is returned undecoded: its declaration states its encoding, so that ET can parse it directly
+        output_bytes = self._call_subprocess(args, input_str.encode(encoding))
+        return output_bytes
 
     def _make_cpp_str_by_subprocess(self, xml_bytes: bytes, encoding: str) -> str:
-        input_xml_filename = self._random_filename() + ".xml"
-        output_header_filename = self._random_filename() + ".h"
-        with open(input_xml_filename, "wb") as input_xml_file:
-            input_xml_file.write(xml_bytes)
-            input_xml_file.close()
-
-        self._call_subprocess(encoding, input_xml_filename, output_header_filename, False)
-
-        with open(output_header_filename, "rb") as output_header_file:
-            output_bytes = output_header_file.read()
-            output_header_file.close()
-        os.remove(input_xml_filename)
-        os.remove(output_header_filename)
+        args = [self._srcml_executable_path(), "--output-src", "--src-encoding", encoding, "-"]
+        output_bytes = self._call_subprocess(args, xml_bytes)
         code_str = output_bytes.decode(encoding)
         return code_str
 
@@ -158,20 +191,21 @@ class _SrcmlCaller:
         """
         Calls srcml with the given code and return the srcml as xml Element
         """
-        self._stats_code_to_srcml.start()
-
-        if _USE_PYTHON_SRCML_CALLER_MODULE:
-            output_str = self._make_xml_str_by_module(input_str, encoding, dump_positions)
-        else:
-            output_str = self._make_xml_str_by_subprocess(encoding, input_str, dump_positions)
-
-        ET.register_namespace("pos", "http://www.srcML.org/srcML/position")
-        ET.register_namespace("", "http://www.srcML.org/srcML/src")
-        element = ET.fromstring(output_str)
+        cache_key = (encoding, input_str, dump_positions)
+        output_xml = self._cache_code_to_srcml.get(cache_key)
+        if output_xml is None:
+            self._stats_code_to_srcml.start()
+            if _USE_PYTHON_SRCML_CALLER_MODULE:
+                output_xml = self._make_xml_str_by_module(input_str, encoding, dump_positions)
+            else:
+                output_xml = self._make_xml_bytes_by_subprocess(encoding, input_str, dump_positions)
+            self._stats_code_to_srcml.stop()
+            _store_in_bounded_cache(self._cache_code_to_srcml, cache_key, output_xml, len(input_str))
+
+        element = ET.fromstring(output_xml)
         if "filename" in element.attrib.keys():
             del element.attrib["filename"]
 
-        self._stats_code_to_srcml.stop()
         return element
 
     def srcml_to_code(self, encoding: str, element: ET.Element) -> str:
@@ -181,23 +215,70 @@ class _SrcmlCaller:
         if element is None:
             return "<srcml_to_code(None)>"
 
-        unit_element = _embed_element_into_unit(element)
-        xml_bytes: bytes = ET.tostring(unit_element, encoding="utf8", method="xml")
-        xml_str = xml_bytes.decode("utf8")
+        return self._unit_xml_bytes_to_code(encoding, _unit_xml_bytes(element))
+
+    def _unit_xml_bytes_to_code(self, encoding: str, xml_bytes: bytes) -> str:
+        cache_key = (encoding, xml_bytes)
+        cached_code_str = self._cache_srcml_to_code.get(cache_key)
+        if cached_code_str is not None:
+            return cached_code_str
 
         self._stats_srcml_to_code.start()
 
         code_str: str
         if _USE_PYTHON_SRCML_CALLER_MODULE:
-            code_str = self._make_cpp_str_by_module(xml_str, encoding)
+            code_str = self._make_cpp_str_by_module(xml_bytes.decode("utf8"), encoding)
         else:
             code_str = self._make_cpp_str_by_subprocess(xml_bytes, encoding)
 
         self._stats_srcml_to_code.stop()
+        _store_in_bounded_cache(self._cache_srcml_to_code, cache_key, code_str, len(xml_bytes))
         return code_str
 
+    def srcml_to_code_batch(self, encoding: str, elements: list[ET.Element]) -> list[str]:
+        """
+        Same as srcml_to_code, but converts several elements with at most one call to srcml:
+        the elements are gathered into a single unit, separated by sentinel comments,
+        and the resulting code is then split back into pieces.
+        """
+        # Each element is serialized only once: the bytes serve as cache keys, and are reused if srcml is called
+        elements_xml_bytes = [_unit_xml_bytes(element) for element in elements]
+        r: list[Optional[str]] = []
+        missing_indices: list[int] = []
+        for i, xml_bytes in enumerate(elements_xml_bytes):
+            cached_code_str = self._cache_srcml_to_code.get((encoding, xml_bytes))
+            r.append(cached_code_str)
+            if cached_code_str is None:
+                missing_indices.append(i)
+
+        if len(missing_indices) == 1:
+            i = missing_indices[0]
+            r[i] = self._unit_xml_bytes_to_code(encoding, elements_xml_bytes[i])
+        elif len(missing_indices) > 1:
+            unit_element = ET.Element("unit")
+            for slot_idx, i in enumerate(missing_indices):
+                element = elements[i]
+                sentinel = ET.SubElement(unit_element, _element_namespace_prefix(element) + "comment", type="block")
+                sentinel.text = _BATCH_SLOT_SENTINEL_FORMAT.format(slot_idx)
+                unit_element.append(element)
+            batch_code = self.srcml_to_code(encoding, unit_element)
+            pieces = _BATCH_SLOT_SENTINEL_REGEX.split(batch_code)[1:]
+            if len(pieces) == len(missing_indices):
+                for i, piece in zip(missing_indices, pieces):
+                    r[i] = piece
+                    _store_in_bounded_cache(
+                        self._cache_srcml_to_code, (encoding, elements_xml_bytes[i]), piece, len(elements_xml_bytes[i])
+                    )
+            else:
+                # The code contained something that looks like a sentinel: convert the elements one by one
+                for i in missing_indices:
+                    r[i] = self._unit_xml_bytes_to_code(encoding, elements_xml_bytes[i])
+
+        assert all(code_str is not None for code_str in r)
+        return cast(list[str], r)
+
     def total_time(self) -> float:
-        total_time = self._stats_code_to_srcml.total_time + self._stats_srcml_to_code.total_time
+        total_time = self._stats_code_to_srcml.total_time() + self._stats_srcml_to_code.total_time()
         return total_time
 
     def profiling_stats(self) -> str:
@@ -224,3 +305,7 @@ def code_to_srcml(code: str, dump_positions: bool = True, encoding: str = "utf-8
 
 def srcml_to_code(element: ET.Element, encoding: str = "utf-8") -> str:
     return _SRCML_CALLER.srcml_to_code(encoding, element)
+
+
+def srcml_to_code_batch(elements: list[ET.Element], encoding: str = "utf-8") -> list[str]:
+    return _SRCML_CALLER.srcml_to_code_batch(encoding, elements)
@@ -7,7 +7,7 @@ The main interface of this module is:
 All the other functions can be considered private to this module.
 """
 from __future__ import annotations
-from typing import Optional
+from typing import Callable, Optional
 from xml.etree import ElementTree as ET
 
 import srcmlcpp.internal.code_to_srcml
@@ -49,6 +49,7 @@ from srcmlcpp.cpp_types import (
 from srcmlcpp.internal import code_to_srcml, srcml_comments, srcml_utils, fix_brace_init_default_value
 from srcmlcpp.internal.srcmlcpp_exception_detailed import (
     SrcmlcppExceptionDetailed,
+    is_warning_muted,
 )
 from srcmlcpp.srcmlcpp_options import SrcmlcppOptions
 
@@ -90,7 +91,7 @@ def parse_type(
         element_text = element.text()
         if element_text is None:
             # case for composed type
-            return element.str_code_verbatim().strip()
+            return _composed_element_code(element)
         else:
             return element_text
 
@@ -141,7 +142,31 @@ def parse_type(
     return result
 
 
-def _parse_expr(element: SrcmlWrapper) -> str:
+def _composed_element_code(element: SrcmlWrapper) -> str:
+    """The code of a composed element (type name, decl name, etc.), recomposed from its texts when possible,
+    in order to avoid a call to srcml"""
+    code = srcml_utils.code_from_element_texts(element.srcml_xml)
+    if code is None:
+        code = element.str_code_verbatim()
+    return code.strip()
+
+
+def _expr_literal_value(expr_element: ET.Element) -> Optional[str]:
+    # Case for simple literals
+    if len(expr_element) != 1:
+        return None
+    else:
+        for expr_child in expr_element:
+            if srcml_utils.clean_tag_or_attrib(expr_child.tag) in [
+                "literal",
+                "name",
+            ]:
+                if expr_child.text is not None:
+                    return expr_child.text
+    return None
+
+
+def _parse_exprs(elements: list[SrcmlWrapper]) -> list[str]:
     """
     Can parse simple literals, like "hello", whose tree looks like:
             <ns0:expr>
@@ -154,32 +179,28 @@ def _parse_expr(element: SrcmlWrapper) -> str:
                 <ns0:operator><</ns0:operator>
                 <ns0:literal type="number">20</ns0:literal>
             </ns0:expr>
-    we will call srcml_to_code, which will invoke the executable srcml
+    we recompose the code from the texts of the tree, or if not possible, we will call srcml_to_code,
+    which will invoke the executable srcml (all these expressions are converted via a single call)
     """
+    for element in elements:
+        assert element.tag() == "expr"
 
-    def expr_literal_value(expr_element: ET.Element) -> Optional[str]:
-        # Case for simple literals
-        if len(expr_element) != 1:
-            return None
-        else:
-            for expr_child in expr_element:
-                if srcml_utils.clean_tag_or_attrib(expr_child.tag) in [
-                    "literal",
-                    "name",
-                ]:
-                    if expr_child.text is not None:
-                        return expr_child.text
-        return None
+    r: list[Optional[str]] = []
+    for expr in elements:
+        expr_value = _expr_literal_value(expr.srcml_xml)
+        if expr_value is None:
+            expr_value = srcml_utils.code_from_element_texts(expr.srcml_xml)
+        r.append(expr_value)
+    complex_indices = [i for i, literal_value in enumerate(r) if literal_value is None]
+    complex_codes = code_to_srcml.srcml_to_code_batch([elements[i].srcml_xml for i in complex_indices])
+    for i, code in zip(complex_indices, complex_codes):
+        r[i] = code
 
-    assert element.tag() == "expr"
-    expr = element
-    eval_literal_value = expr_literal_value(expr.srcml_xml)
-    if eval_literal_value is not None:
-        r = eval_literal_value
-    else:
-        r = code_to_srcml.srcml_to_code(expr.srcml_xml)
+    return [code_utils.str_none_empty(v) for v in r]
 
-    return r
+
+def _parse_expr(element: SrcmlWrapper) -> str:
+    return _parse_exprs([element])[0]
 
 
 def _parse_init_expr(element: SrcmlWrapper) -> str:
@@ -189,7 +210,7 @@ def _parse_init_expr(element: SrcmlWrapper) -> str:
     if expr is not None:
         r = _parse_expr(expr)
     else:
-        r = element.str_code_verbatim().strip()
+        r = _composed_element_code(element)
         if r.startswith("="):
             r = r[1:]
 
@@ -201,7 +222,7 @@ def _parse_name(element: SrcmlWrapper) -> str:
     element_text = element.text()
     if element_text is None:
         # composed name
-        name = element.str_code_verbatim().strip()
+        name = _composed_element_code(element)
     else:
         name = element_text.strip()
     return name
@@ -277,14 +298,14 @@ def parse_define(options: SrcmlcppOptions, element_c: CppElementAndComment, pare
 def _parse_decl_initializer_list(_options: SrcmlcppOptions, element_c: SrcmlWrapper) -> str:
     assert element_c.tag() == "argument_list"
     arguments = element_c.wrapped_children_with_tag("argument")
-    arguments_values = []
+    exprs = []
     for argument in arguments:
         expr = argument.wrapped_child_with_tag("expr")
         if expr is None:
             element_c.raise_exception("parse_decl: initializer list with with unparsable expr")
         else:
-            expr_value = _parse_expr(expr)
-            arguments_values.append(expr_value)
+            exprs.append(expr)
+    arguments_values = _parse_exprs(exprs)
 
     if len(arguments_values) == 0:
         return "{}"
@@ -514,6 +535,7 @@ def parse_function_decl(
     https://www.srcml.org/doc/cpp_srcML.html#function-declaration
     """
     assert element_c.tag() in ["function_decl", "destructor_decl"]
+    assert element_c.has_xml_name()
     result = CppFunctionDecl(element_c, element_c.cpp_element_comments)
     result.parent = parent
     fill_function_decl(options, element_c, result)
@@ -527,6 +549,7 @@ def parse_function(
     https://www.srcml.org/doc/cpp_srcML.html#function-definition
     """
     assert element_c.tag() in ["function", "destructor"]
+    assert element_c.has_xml_name()
     result = CppFunction(element_c, element_c.cpp_element_comments)
     result.parent = parent
     fill_function_decl(options, element_c, result)
@@ -697,6 +720,8 @@ def parse_struct_or_class(
     """
     element_tag = element_c.tag()
     assert element_tag in ["struct", "class"]
+    if not element_c.has_xml_name():
+        element_c.raise_exception("struct or class without name")
     if element_tag == "struct":
         result = CppStruct(element_c, element_c.cpp_element_comments)
     else:
@@ -812,13 +837,14 @@ def fill_extern_c_block(options: SrcmlcppOptions, element: SrcmlWrapper, inout_b
         </unit>
 
     """
-    literal_elements = element.wrapped_children_with_tag("literal")
+    children_by_tag = element.wrapped_children_by_tag()
+    literal_elements = children_by_tag.get("literal", [])
     if len(literal_elements) != 1:
         return
     extern_type = literal_elements[0].text()
     if extern_type != '"C"':
         return
-    block_elements = element.wrapped_children_with_tag("block")
+    block_elements = children_by_tag.get("block", [])
     if len(block_elements) != 1:
         return
     block_contents = block_elements[0].wrapped_children_with_tag("block_content")
@@ -830,18 +856,21 @@ def fill_extern_c_block(options: SrcmlcppOptions, element: SrcmlWrapper, inout_b
 def fill_block(options: SrcmlcppOptions, element: SrcmlWrapper, inout_block_content: CppBlock) -> None:
     """
     https://www.srcml.org/doc/cpp_srcML.html#block_content
+
+    Note: the children are parsed sequentially, in order. They cannot be dispatched to a pool of workers,
+    since they are linked to their parents, and since the parse depends on a shared state
+    (code cache, options with user callbacks, warnings, and progress bar).
     """
 
     last_ignored_child: Optional[CppElementAndComment] = None
+    block_children = inout_block_content.block_children
 
     children: list[CppElementAndComment] = srcml_comments.get_children_with_comments(element)
     for _i, child_c in enumerate(children):
         global_progress_bars().set_current_line(_PROGRESS_BAR_TITLE_SRCML_PARSE, child_c.start().line)
 
         child_tag = child_c.tag()
-        child_name = child_c.extract_name_from_xml()
 
-        block_children = inout_block_content.block_children
         try:
             if child_tag == "decl_stmt":
                 cpp_decl_stmt = parse_decl_stmt(options, child_c, inout_block_content)
@@ -855,26 +884,9 @@ def fill_block(options: SrcmlcppOptions, element: SrcmlWrapper, inout_block_cont
                     block_children.append(fixed_function)
                 else:
                     block_children.append(cpp_decl_stmt)
-            elif child_tag == "macro" and isinstance(inout_block_content, CppPublicProtectedPrivate):
-                # Fixed brace init default / constructors
-                macro_maybe_constructor = parse_unprocessed(options, child_c, inout_block_content)
-                fixed_ctor = fix_brace_init_default_value.change_macro_to_constructor(options, macro_maybe_constructor)
-                if fixed_ctor is not None:
-                    block_children.append(fixed_ctor)
-            elif child_tag == "decl":
-                cpp_decl = parse_decl(options, child_c, inout_block_content, None)
-                block_children.append(cpp_decl)
-            elif child_tag in ["function_decl", "destructor_decl"]:
-                assert child_name is not None
-                block_children.append(parse_function_decl(options, child_c, inout_block_content))
-            elif child_tag in ["function", "destructor"]:
-                assert child_name is not None
-                block_children.append(parse_function(options, child_c, inout_block_content))
-            elif child_tag == "constructor_decl":
-                block_children.append(parse_constructor_decl(options, child_c, inout_block_content))
-            elif child_tag == "constructor":
-                block_children.append(parse_constructor(options, child_c, inout_block_content))
-
+            elif child_tag in _BLOCK_CHILD_PARSERS:
+                parse_child = _BLOCK_CHILD_PARSERS[child_tag]
+                block_children.append(parse_child(options, child_c, inout_block_content))
             elif child_tag == "comment":
                 cpp_comment = parse_comment(options, child_c, inout_block_content)
 
@@ -885,38 +897,24 @@ def fill_block(options: SrcmlcppOptions, element: SrcmlWrapper, inout_block_cont
                 else:
                     if not shall_ignore_comment(cpp_comment, last_ignored_child):
                         block_children.append(cpp_comment)
-
-            elif child_tag == "struct" or child_tag == "class":
-                # assert child_name is not None
-                if child_name is None:
-                    child_c.raise_exception("struct or class without name")
-                block_children.append(parse_struct_or_class(options, child_c, inout_block_content))
-            elif child_tag == "namespace":
-                block_children.append(parse_namespace(options, child_c, inout_block_content))
-            elif child_tag == "enum":
-                block_children.append(parse_enum(options, child_c, inout_block_content))
-            elif child_tag == "block_content":
-                block_children.append(parse_block_content(options, child_c, inout_block_content))
-            elif child_tag == "define":
-                block_children.append(parse_define(options, child_c, inout_block_content))
-            elif child_tag in [
-                "if",
-                "ifdef",
-                "ifndef",
-                "endif",
-                "else",
-                "elif",
-            ]:  # #if, #ifdef, #ifndef, #endif, #else, #elif
-                block_children.append(parse_condition_macro(options, child_c, inout_block_content))
+            elif child_tag == "macro" and isinstance(inout_block_content, CppPublicProtectedPrivate):
+                # Fixed brace init default / constructors
+                macro_maybe_constructor = parse_unprocessed(options, child_c, inout_block_content)
+                fixed_ctor = fix_brace_init_default_value.change_macro_to_constructor(options, macro_maybe_constructor)
+                if fixed_ctor is not None:
+                    block_children.append(fixed_ctor)
+            elif child_tag == "decl":
+                cpp_decl = parse_decl(options, child_c, inout_block_content, None)
+                block_children.append(cpp_decl)
             elif child_tag == "extern":
                 fill_extern_c_block(options, child_c, inout_block_content)
-            elif child_tag in ["public", "protected", "private"]:
-                block_children.append(parse_public_protected_private(options, child_c, inout_block_content))
             else:
                 last_ignored_child = child_c
                 block_children.append(parse_unprocessed(options, child_c, inout_block_content))
         except SrcmlcppExceptionDetailed as e:
             block_children.append(parse_unprocessed(options, child_c, inout_block_content))
+            if is_warning_muted(options, WarningType.SrcmlcppIgnoreElement):
+                continue  # do not format the exception message
             element.emit_warning(
                 f'A cpp element of type "{child_tag}" was stored as CppUnprocessed. Details follow\n{e}',
                 WarningType.SrcmlcppIgnoreElement,
@@ -1023,3 +1021,31 @@ def parse_enum(options: SrcmlcppOptions, element_c: CppElementAndComment, parent
             raise SrcmlcppExceptionDetailed(child, f"unhandled tag {child_tag}")
 
     return result
+
+
+# Parsers for the block children which do not need special handling in fill_block, indexed by tag
+_BlockChildParser = Callable[[SrcmlcppOptions, CppElementAndComment, CppElementAndComment], CppElementAndComment]
+_BLOCK_CHILD_PARSERS: dict[str, _BlockChildParser] = {
+    "function_decl": parse_function_decl,
+    "destructor_decl": parse_function_decl,
+    "function": parse_function,
+    "destructor": parse_function,
+    "constructor_decl": parse_constructor_decl,
+    "constructor": parse_constructor,
+    "struct": parse_struct_or_class,
+    "class": parse_struct_or_class,
+    "namespace": parse_namespace,
+    "enum": parse_enum,
+    "block_content": parse_block_content,
+    "define": parse_define,
+    # #if, #ifdef, #ifndef, #endif, #else, #elif
+    "if": parse_condition_macro,
+    "ifdef": parse_condition_macro,
+    "ifndef": parse_condition_macro,
+    "endif": parse_condition_macro,
+    "else": parse_condition_macro,
+    "elif": parse_condition_macro,
+    "public": parse_public_protected_private,
+    "protected": parse_public_protected_private,
+    "private": parse_public_protected_private,
+}
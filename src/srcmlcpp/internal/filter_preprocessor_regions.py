@@ -1,5 +1,4 @@
 from __future__ import annotations
-import copy
 from typing import Optional
 from xml.etree import ElementTree as ET
 
@@ -56,6 +55,10 @@ void FooAccepted();
 """
 
 
+_PREPROCESSOR_OPENING_TAGS = frozenset(["ifdef", "if", "ifndef"])
+_PREPROCESSOR_TEST_TAGS = _PREPROCESSOR_OPENING_TAGS | frozenset(["endif", "else", "elif"])
+
+
 class _SrcmlPreprocessorState:
     """We ignore everything that is inside a #ifdef/#if/#ifndef  region
     but we try to keep what is inside the header inclusion guard ifndef region.
@@ -100,31 +103,19 @@ class _SrcmlPreprocessorState:
         self.last_element = element
         tag = srcml_utils.clean_tag_or_attrib(element.tag)
 
-        is_ifdef = tag in ["ifdef", "if", "endif", "else", "elif", "ifndef"]
-
         end = srcml_utils.element_end_position(element)
         if end is None:
             return
         element_line = end.line
 
-        def extract_ifdef_var_name() -> str:
-            if not is_ifdef:
-                return ""
-            for child in element:
-                if srcml_utils.clean_tag_or_attrib(child.tag) == "name":
-                    assert child.text is not None
-                    return child.text
-            return ""
-
-        ifdef_var_name = extract_ifdef_var_name()
-
         self.was_last_element_an_ignored_endif = False
-        if tag in ["ifdef", "if"]:
-            self.last_ignored_preprocessor_stmt_line = element_line
-            self.encountered_if.append(ifdef_var_name)
-        elif tag == "ifndef":
+        # Most elements are not preprocessor tests: nothing more to do for them
+        if tag not in _PREPROCESSOR_TEST_TAGS:
+            return
+
+        if tag in _PREPROCESSOR_OPENING_TAGS:
             self.last_ignored_preprocessor_stmt_line = element_line
-            self.encountered_if.append(ifdef_var_name)
+            self.encountered_if.append(self._extract_ifdef_var_name(element))
         elif tag == "endif":
             if self.has_one_excluded_ifdef():
                 self.was_last_element_an_ignored_endif = True
@@ -133,13 +124,21 @@ class _SrcmlPreprocessorState:
             # so that we cannot rely on having len(self.encountered_if) > 0
             # assert len(self.encountered_if) > 0
             if len(self.encountered_if) > 0:
-                self.encountered_if = self.encountered_if[:-1]
-        elif tag in ["else", "elif"]:
+                self.encountered_if.pop()
+        else:  # else, elif
             self.last_ignored_preprocessor_stmt_line = element_line
 
-        if self.debug and is_ifdef:
+        if self.debug:
             self._log_state(element)
 
+    @staticmethod
+    def _extract_ifdef_var_name(element: ET.Element) -> str:
+        for child in element:
+            if srcml_utils.clean_tag_or_attrib(child.tag) == "name":
+                assert child.text is not None
+                return child.text
+        return ""
+
     def has_one_excluded_ifdef(self) -> bool:
         for ifdef_var_name in self.encountered_if:
             if not code_utils.does_match_regex(self.header_acceptable__regex, ifdef_var_name):
@@ -163,16 +162,16 @@ class _SrcmlPreprocessorState:
 
 
 def filter_preprocessor_regions(unit: ET.Element, header_acceptable__regex: str) -> ET.Element:
-    filtered_unit = copy.deepcopy(unit)
+    # Only the container is new: the kept children are shared with the original unit (they are not modified here).
+    # This avoids a deep copy of the whole xml tree, while leaving the original unit untouched.
+    filtered_unit = ET.Element(unit.tag, unit.attrib)
+    filtered_unit.text = unit.text
+    filtered_unit.tail = unit.tail
     processor = _SrcmlPreprocessorState(header_acceptable__regex)
-    children_to_remove = []
 
-    for child in filtered_unit:
+    for child in unit:
         processor.process_tag(child)
-        if processor.shall_ignore():
-            children_to_remove.append(child)
-
-    for child_to_remove in children_to_remove:
-        filtered_unit.remove(child_to_remove)
+        if not processor.shall_ignore():
+            filtered_unit.append(child)
 
     return filtered_unit
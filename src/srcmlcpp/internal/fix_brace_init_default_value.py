@@ -103,6 +103,8 @@ def _rewrite_decl_if_suspicious_fn_decl(decl_stmt: CppDeclStatement) -> Optional
         return None
 
     hacked_decl = copy.deepcopy(decl)
+    # SrcmlWrapper.__deepcopy__() forces a shallow copy of srcml_xml: clone it, since it is modified below
+    hacked_decl.srcml_xml = copy.deepcopy(decl.srcml_xml)
     arg_lists = hacked_decl.wrapped_children_with_tag("argument_list")
     if len(arg_lists) == 0:
         return None
@@ -113,9 +115,11 @@ def _rewrite_decl_if_suspicious_fn_decl(decl_stmt: CppDeclStatement) -> Optional
     for argument in arguments:
         expr = argument.wrapped_child_with_tag("expr")
         if expr is not None:
-            names = expr.wrapped_children_with_tag("name")
-            operators = expr.wrapped_children_with_tag("operator")
-            block = expr.wrapped_child_with_tag("block")
+            expr_children = expr.wrapped_children_by_tag()
+            names = expr_children.get("name", [])
+            operators = expr_children.get("operator", [])
+            blocks = expr_children.get("block", [])
+            block = blocks[0] if len(blocks) == 1 else None
             if len(names) == 2 and len(operators) > 0 and block is not None:
                 has_one_equal_operator = False
                 for operator in operators:
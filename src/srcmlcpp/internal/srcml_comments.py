@@ -132,10 +132,13 @@ def _group_consecutive_comments(srcml_code: SrcmlWrapper) -> SrcmlWrapper:
         def add_child(child=child) -> None:  # type: ignore
             nonlocal previous_child, previous_previous_child
 
-            # In this low level case, we need to manually clone child.srcml_xml,
-            # since SrcmlWrapper.__deepcopy__() forces a shallow copy of srcml_xml
+            # Comments are modified later (grouped and stripped of their markers), so that we need to
+            # manually clone their srcml_xml, since SrcmlWrapper.__deepcopy__() forces a shallow copy of srcml_xml.
+            # The other children are shared with the original tree: copying them would retain
+            # an additional copy of the xml tree for each nesting level.
             child_copy = copy.copy(child)
-            child_copy.srcml_xml = copy.deepcopy(child.srcml_xml)
+            if child.tag() == "comment":
+                child_copy.srcml_xml = copy.deepcopy(child.srcml_xml)
 
             srcml_xml_grouped.append(child_copy.srcml_xml)
             previous_previous_child = previous_child
@@ -193,10 +196,6 @@ def _group_consecutive_comments(srcml_code: SrcmlWrapper) -> SrcmlWrapper:
         else:
             add_child()
 
-    children_r: list[ET.Element] = []
-    for child_r in srcml_xml_grouped:
-        children_r.append(child_r)
-
     r = SrcmlWrapper(srcml_code.options, srcml_xml_grouped, srcml_code.filename)
     return r
 
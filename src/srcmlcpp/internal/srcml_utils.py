@@ -6,6 +6,7 @@ This module *must* not depend on srcml_types!
 from __future__ import annotations
 import logging
 import os
+import sys
 from typing import Any, Optional
 from xml.dom import minidom
 from xml.etree import ElementTree as ET  # noqa
@@ -13,35 +14,52 @@ from xml.etree import ElementTree as ET  # noqa
 from codemanip.code_position import CodePosition
 
 
-def _element_position(element: ET.Element, start_or_end: str) -> Optional[CodePosition]:
-    r = None
-    for key, value in element.attrib.items():
-        if clean_tag_or_attrib(key) == start_or_end:
-            r = CodePosition.from_string(value)
-    return r
+# Position attributes, as named by ElementTree (with the srcML position namespace)
+_POSITION_NAMESPACE = "{http://www.srcML.org/srcML/position}"
+_START_ATTRIB = _POSITION_NAMESPACE + "start"
+_END_ATTRIB = _POSITION_NAMESPACE + "end"
+
+
+def _element_position_attrib(element: ET.Element, qualified_key: str, key: str) -> Optional[str]:
+    attrib = element.attrib
+    value = attrib.get(qualified_key)
+    if value is None:
+        value = attrib.get(key)
+    return value
 
 
 def element_start_position(element: ET.Element) -> Optional[CodePosition]:
-    return _element_position(element, "start")
+    value = _element_position_attrib(element, _START_ATTRIB, "start")
+    return None if value is None else CodePosition.from_string(value)
 
 
 def element_end_position(element: ET.Element) -> Optional[CodePosition]:
-    return _element_position(element, "end")
+    value = _element_position_attrib(element, _END_ATTRIB, "end")
+    return None if value is None else CodePosition.from_string(value)
 
 
 def copy_element_end_position(element_src: ET.Element, element_dst: ET.Element) -> None:
-    for key, value in element_src.attrib.items():
-        if clean_tag_or_attrib(key) == "end":
-            end_position = value
+    for key in (_END_ATTRIB, "end"):
+        end_position = element_src.attrib.get(key)
+        if end_position is not None:
             element_dst.attrib[key] = end_position
 
 
 def children_with_tag(element: ET.Element, tag: str) -> list[ET.Element]:
-    r = []
+    # The cleaned tags are read from the cache directly: this is the per-child hot loop of the parse
+    cache = _CLEAN_TAG_OR_ATTRIB_CACHE
+    return [child for child in element if (cache.get(child.tag) or clean_tag_or_attrib(child.tag)) == tag]
+
+
+def children_by_tag(element: ET.Element) -> dict[str, list[ET.Element]]:
+    """The children of an element, grouped by tag, in one pass over the children.
+    Use this instead of several calls to children_with_tag on the same element.
+    (the result is not stored on the element, since srcmlcpp modifies some trees in place)
+    """
+    cache = _CLEAN_TAG_OR_ATTRIB_CACHE
+    r: dict[str, list[ET.Element]] = {}
     for child in element:
-        child_tag = clean_tag_or_attrib(child.tag)
-        if child_tag == tag:
-            r.append(child)
+        r.setdefault(cache.get(child.tag) or clean_tag_or_attrib(child.tag), []).append(child)
     return r
 
 
@@ -57,13 +75,31 @@ def child_with_tag(element: ET.Element, tag: str) -> Optional[ET.Element]:
         return children[0]
 
 
+def code_from_element_texts(element: ET.Element) -> Optional[str]:
+    """Recomposes the code of an element by concatenating its texts, without calling srcml.
+
+    srcML stores all the characters of the code as text, so that the result is identical to
+    code_to_srcml.srcml_to_code(element) (including the tail of the element).
+    Returns None when the element contains nodes that need srcml (or srcmlcpp) to be reconstructed:
+        * <escape> nodes, which store control characters as attributes
+        * comments, which may contain the empty lines markers added by srcmlcpp
+    """
+    for descendant in element.iter():
+        if clean_tag_or_attrib(descendant.tag) in ("escape", "comment"):
+            return None
+    return "".join(element.itertext()) + str_or_empty(element.tail)
+
+
 def srcml_to_str(element: ET.Element, bare: bool = False) -> str:
     xmlstr_raw = ET.tostring(element, encoding="unicode")
     if bare:
         return xmlstr_raw
 
+    # Note: ET.indent() is not used, since it leaves the texts of srcML mixed content (e.g. "=" in <init>)
+    # inline with the tags, whereas minidom writes them on separate lines.
+    # The raw string is reused here, so that the element is serialized only once.
     try:
-        xmlstr: str = minidom.parseString(ET.tostring(element)).toprettyxml(indent="   ")
+        xmlstr: str = minidom.parseString(xmlstr_raw).toprettyxml(indent="   ")
     except Exception:
         xmlstr = xmlstr_raw
 
@@ -75,11 +111,26 @@ def srcml_write_to_file(encoding: str, root: ET.Element, filename: str) -> None:
     element_tree.write(filename, encoding=encoding)
 
 
+# Cache for clean_tag_or_attrib (srcML uses a small set of distinct tags and attributes).
+# The cleaned values are interned, so that comparing them with the tag literals used in srcmlcpp
+# (which are interned by Python) usually succeeds on the identity check.
+_CLEAN_TAG_OR_ATTRIB_CACHE: dict[str, str] = {}
+
+
 def clean_tag_or_attrib(tag_name: str) -> str:
+    cleaned = _CLEAN_TAG_OR_ATTRIB_CACHE.get(tag_name)
+    if cleaned is None:
+        cleaned = sys.intern(_clean_tag_or_attrib_impl(tag_name))
+        _CLEAN_TAG_OR_ATTRIB_CACHE[tag_name] = cleaned
+    return cleaned
+
+
+def _clean_tag_or_attrib_impl(tag_name: str) -> str:
     if tag_name.startswith("{"):
+        # "{namespace}tag": the "ns0:" / "ns1:" prefixes only appear in the other form
         assert "}" in tag_name
         pos = tag_name.index("}") + 1
-        tag_name = tag_name[pos:]
+        return tag_name[pos:]
     tag_name = tag_name.replace("ns0:", "")
     tag_name = tag_name.replace("ns1:", "")
     return tag_name
@@ -128,22 +179,25 @@ def _info_element_position(element: ET.Element) -> str:
 
 
 def srcml_to_str_readable(srcml_element: ET.Element, level: int = 0) -> str:
-    indent_str = "    " * level
-
-    msg: str
-    msg = indent_str + clean_tag_or_attrib(srcml_element.tag)
-    text = _extract_interesting_text(srcml_element)
-    if len(text) > 0:
-        msg += f' text="{text}"'
-
-    info_position = _info_element_position(srcml_element)
-    if len(info_position) > 0:
-        msg += " " * (60 - len(msg)) + info_position
-    msg += "\n"
-
-    for child in srcml_element:
-        msg += srcml_to_str_readable(child, level + 1)
-    return msg
+    lines: list[str] = []
+    # Iterative traversal (with an explicit stack), in the document order
+    stack: list[tuple[ET.Element, int]] = [(srcml_element, level)]
+    while len(stack) > 0:
+        element, element_level = stack.pop()
+
+        msg: str
+        msg = "    " * element_level + clean_tag_or_attrib(element.tag)
+        text = _extract_interesting_text(element)
+        if len(text) > 0:
+            msg += f' text="{text}"'
+
+        info_position = _info_element_position(element)
+        if len(info_position) > 0:
+            msg += " " * (60 - len(msg)) + info_position
+        lines.append(msg + "\n")
+
+        stack.extend((child, element_level + 1) for child in reversed(element))
+    return "".join(lines)
 
 
 def check_for_file_in_current_hierarchy(filename: str) -> bool:
@@ -1,8 +1,8 @@
 from __future__ import annotations
-import inspect
 import logging
 import sys
 import traceback
+from typing import Optional
 
 from codemanip import code_utils
 
@@ -13,19 +13,40 @@ from srcmlcpp.scrml_warning_settings import WarningType
 
 
 class SrcmlcppExceptionDetailed(SrcmlcppException):
+    """An exception whose message gives the location of the element in the code
+    (the message is formatted when the exception is converted to str)
+    """
+
+    current_element: SrcmlWrapper
+    additional_message: str
+    _python_call_info: Optional[tuple[str, str]]
+    _message: Optional[str]
+
     def __init__(self, current_element: SrcmlWrapper, additional_message: str) -> None:
-        message = current_element._format_message(additional_message)
-        super().__init__(message)
+        super().__init__(additional_message)
+        self.current_element = current_element
+        self.additional_message = additional_message
+        self._message = None
+        self._python_call_info = None
+        if current_element.options.flag_show_python_callstack:
+            # The call info must be captured now: the call stack will be different when the message is formatted
+            self._python_call_info = _get_python_call_info(frames_up=2)
 
+    def __str__(self) -> str:
+        if self._message is None:
+            self._message = self.current_element._format_message(
+                self.additional_message, python_call_info=self._python_call_info
+            )
+        return self._message
 
-def _get_python_call_info() -> tuple[str, str]:
-    stack_lines = traceback.format_stack()
-    error_line = stack_lines[-4]
-    frame = inspect.currentframe()
-    if frame is not None:
-        caller_function_name = inspect.getframeinfo(frame.f_back.f_back.f_back).function  # type: ignore
-    else:
-        caller_function_name = ""
+
+def _get_python_call_info(frames_up: int = 3) -> tuple[str, str]:
+    """Returns the function name and the formatted call line of the frame which is `frames_up` above this function.
+    By default, this is the caller of the function which called _format_message (i.e. raise_exception or emit_warning)
+    """
+    frame = sys._getframe(frames_up)
+    caller_function_name = frame.f_code.co_name
+    error_line = traceback.format_stack(frame, limit=1)[0]
     return caller_function_name, error_line
 
 
@@ -36,10 +57,13 @@ def show_python_callstack(python_error_line: str) -> str:
     """
 
 
+def is_warning_muted(options: SrcmlcppOptions, warning_type: WarningType) -> bool:
+    """Returns True if warnings of this type are discarded, whatever their message"""
+    return options.flag_quiet or warning_type in options.ignored_warnings
+
+
 def emit_warning_if_not_quiet(options: SrcmlcppOptions, message: str, warning_type: WarningType) -> None:
-    if options.flag_quiet:
-        return
-    if warning_type in options.ignored_warnings:
+    if is_warning_muted(options, warning_type):
         return
     for ignored_warning_part in options.ignored_warning_parts:
         if ignored_warning_part in message:
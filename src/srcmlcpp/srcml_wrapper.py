@@ -26,8 +26,6 @@ class SrcmlWrapper:
     srcml_xml: ET.Element
     # the filename from which this tree was parsed
     filename: str | None = None
-    # debugging help: a string showing the start position of this element in the code
-    code_location: str
 
     def __init__(self, options: SrcmlcppOptions, srcml_xml: ET.Element, filename: str | None) -> None:
         """Create a wrapper from a xml sub node
@@ -47,21 +45,6 @@ class SrcmlWrapper:
 
         self.filename = filename
 
-        # fill code_location
-        def fill_code_location() -> str:
-            if filename is None:
-                filename_simple = ""
-            else:
-                filename_normalized = filename.replace("\\", "/")
-                items = filename_normalized.split("/")
-                items = items[-3:]
-                filename_simple = "/".join(items)
-            start_loc = self.start()
-            r = f"{filename_simple}:{start_loc.line}:{start_loc.column}"
-            return r
-
-        self.code_position_start = fill_code_location()
-
     def __deepcopy__(self, memo=None):
         """SrcmlWrapper.__deepcopy__: force shallow copy of SrcmlcppOptions and srcml_xml (ET.Element)
         This improves the performance a lot.
@@ -85,6 +68,20 @@ class SrcmlWrapper:
                 setattr(result, k, v)
         return result
 
+    @property
+    def code_position_start(self) -> str:
+        """Debugging help: a string showing the start position of this element in the code"""
+        if self.filename is None:
+            filename_simple = ""
+        else:
+            filename_normalized = self.filename.replace("\\", "/")
+            items = filename_normalized.split("/")
+            items = items[-3:]
+            filename_simple = "/".join(items)
+        start_loc = self.start()
+        r = f"{filename_simple}:{start_loc.line}:{start_loc.column}"
+        return r
+
     def tag(self) -> str:
         """The xml tag
         https://www.tutorialspoint.com/xml/xml_tags.htm"""
@@ -134,14 +131,16 @@ class SrcmlWrapper:
                     </index>
                 </name>
         """
-        if not self.has_xml_name():
+        name_children = srcml_utils.children_with_tag(self.srcml_xml, "name")
+        if len(name_children) != 1:
             return None
-        name_element = srcml_utils.child_with_tag(self.srcml_xml, "name")
-        assert name_element is not None
+        name_element = name_children[0]
         if name_element.text is not None:
             return name_element.text
-        else:
-            return code_to_srcml.srcml_to_code(name_element)
+        name_code = srcml_utils.code_from_element_texts(name_element)
+        if name_code is not None:
+            return name_code
+        return code_to_srcml.srcml_to_code(name_element)
 
     def attribute_value(self, attr_name: str) -> str | None:
         """Gets the attribute value if present"""
@@ -183,9 +182,8 @@ class SrcmlWrapper:
 
     def make_wrapped_children(self) -> list[SrcmlWrapper]:
         """Extract the xml sub nodes and wraps them"""
-        r = []
-        for child_xml in self.srcml_xml:
-            r.append(SrcmlWrapper(self.options, child_xml, self.filename))
+        options, filename = self.options, self.filename
+        r = [SrcmlWrapper(options, child_xml, filename) for child_xml in self.srcml_xml]
         return r
 
     def wrapped_child_with_tag(self, tag: str) -> SrcmlWrapper | None:
@@ -195,18 +193,33 @@ class SrcmlWrapper:
 
     def wrapped_children_with_tag(self, tag: str) -> list[SrcmlWrapper]:
         """Extract the xml sub nodes and wraps them"""
-        children = self.make_wrapped_children()
+        r = [
+            SrcmlWrapper(self.options, child_xml, self.filename)
+            for child_xml in srcml_utils.children_with_tag(self.srcml_xml, tag)
+        ]
+        return r
 
-        r = list(filter(lambda child: child.tag() == tag, children))
+    def wrapped_children_by_tag(self) -> dict[str, list[SrcmlWrapper]]:
+        """Extract the xml sub nodes, wraps them, and groups them by tag"""
+        r = {
+            tag: [SrcmlWrapper(self.options, child_xml, self.filename) for child_xml in children_xml]
+            for tag, children_xml in srcml_utils.children_by_tag(self.srcml_xml).items()
+        }
         return r
 
     def visit_xml_breadth_first(self, xml_visitor_function: SrcmlXmVisitorFunction, depth: int = 0) -> None:
         """Visits all the elements, and run the given function on them.
         Runs the visitor on the parent first, then on its children
         """
-        xml_visitor_function(self, depth)
-        for child in self.make_wrapped_children():
-            child.visit_xml_breadth_first(xml_visitor_function, depth + 1)
+        # Iterative traversal with an explicit stack: xml trees are much deeper than the C++ scopes,
+        # and a recursion would cost one Python frame per level (and could reach the recursion limit)
+        stack: list[tuple[SrcmlWrapper, int]] = [(self, depth)]
+        while len(stack) > 0:
+            element, element_depth = stack.pop()
+            xml_visitor_function(element, element_depth)
+            children = element.make_wrapped_children()
+            # push the children in reverse order, so that they are visited in the document order
+            stack.extend((child, element_depth + 1) for child in reversed(children))
 
     def raise_exception(self, message: str) -> None:
         """raises a SrcmlcppException which will display the message with a context
@@ -218,8 +231,11 @@ class SrcmlWrapper:
     def emit_warning(self, message: str, warning_type: WarningType = WarningType.Undefined) -> None:
         """emits a warning which will display the message with a context
         that gives the location of this element in the code"""
+        from srcmlcpp.internal.srcmlcpp_exception_detailed import emit_warning_if_not_quiet, is_warning_muted
+
+        if is_warning_muted(self.options, warning_type):
+            return
         message = self._format_message(message, "Warning")
-        from srcmlcpp.internal.srcmlcpp_exception_detailed import emit_warning_if_not_quiet
 
         emit_warning_if_not_quiet(self.options, message, warning_type)
 
@@ -246,7 +262,12 @@ class SrcmlWrapper:
         """
         return message
 
-    def _format_message(self, additional_message: str, message_header: str = "Warning") -> str:
+    def _format_message(
+        self,
+        additional_message: str,
+        message_header: str = "Warning",
+        python_call_info: tuple[str, str] | None = None,
+    ) -> str:
         from srcmlcpp.internal.srcmlcpp_exception_detailed import _get_python_call_info, show_python_callstack
 
         message = ""
@@ -255,7 +276,9 @@ class SrcmlWrapper:
             message += self._show_element_info()
 
             if self.options.flag_show_python_callstack:
-                python_caller_function_name, python_error_line = _get_python_call_info()
+                if python_call_info is None:
+                    python_call_info = _get_python_call_info()
+                python_caller_function_name, python_error_line = python_call_info
                 message += show_python_callstack(python_error_line)
 
         if len(additional_message) > 0:
@@ -28,6 +28,7 @@ from srcmlcpp.internal import (
     srcml_comments,
     cpp_types_parse,
 )
+from srcmlcpp.internal.srcmlcpp_exception_detailed import SrcmlcppExceptionDetailed
 from srcmlcpp.srcmlcpp_exception import SrcmlcppException
 from srcmlcpp.srcmlcpp_options import SrcmlcppOptions
 
@@ -125,6 +126,46 @@ def code_to_cpp_unit(
     return cpp_unit
 
 
+def _file_to_cpp_unit_in_worker(options: SrcmlcppOptions, filename: str) -> tuple[CppUnit, str]:
+    """Parses a file in a worker process of files_to_cpp_units.
+    The code is returned alongside the unit, since the code cache of the worker is not shared with the main process
+    """
+    try:
+        cpp_unit = _code_to_cpp_unit_impl(options, filename=filename)
+    except SrcmlcppExceptionDetailed as e:
+        # SrcmlcppExceptionDetailed cannot be sent back to the main process (it cannot be unpickled):
+        # its message is formatted here, where the code of the file is available
+        raise SrcmlcppException(str(e)) from None
+    return cpp_unit, code_cache.get_cached_code(filename)
+
+
+def files_to_cpp_units(options: SrcmlcppOptions, filenames: list[str], nb_workers: int | None = None) -> list[CppUnit]:
+    """Parses several files into CppUnits (one per file), using a pool of processes.
+
+    The files are independent, so that they are parsed in parallel (at most nb_workers processes,
+    by default one per CPU). The units are then sent back to this process.
+
+    Note:
+        * the options are sent to the worker processes: they must be picklable
+          (e.g. options.code_preprocess_function must be a module level function, not a lambda)
+        * the elements of the returned units hold a copy of the options
+        * with nb_workers=1, or a single file, the files are parsed in this process
+    """
+    if nb_workers == 1 or len(filenames) <= 1:
+        return [code_to_cpp_unit(options, filename=filename) for filename in filenames]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=nb_workers) as executor:
+        units_and_codes = list(executor.map(_file_to_cpp_unit_in_worker, [options] * len(filenames), filenames))
+
+    r = []
+    for filename, (cpp_unit, code) in zip(filenames, units_and_codes):
+        code_cache.store_cached_code(filename, code)
+        r.append(cpp_unit)
+    return r
+
+
 def code_first_child_of_type(
     options: SrcmlcppOptions, type_of_cpp_element: type[CppElement], code: str
 ) -> CppElementAndComment:
@@ -1,6 +1,11 @@
 from __future__ import annotations
+import logging
 import os
+import shutil
 import sys
+from xml.etree import ElementTree as ET
+
+import pytest
 
 from codemanip import code_utils
 
@@ -75,3 +80,81 @@ def test_srcml_does_not_modify_code():
     auto fnSub = [](int a, int b) { return b - a;};
     """
     )
+
+
+def test_srcml_calls_cache():
+    code = "int a = 1 << 20;"
+    element1 = code_to_srcml.code_to_srcml(code)
+    element2 = code_to_srcml.code_to_srcml(code)
+    # Cached calls still return distinct element trees, which callers may modify
+    assert element1 is not element2
+    assert srcml_utils.srcml_to_str(element1, bare=True) == srcml_utils.srcml_to_str(element2, bare=True)
+
+    assert code_to_srcml.srcml_to_code(element1) == code
+    assert code_to_srcml.srcml_to_code(element2) == code
+
+
+def test_srcml_calls_cache_skips_large_inputs():
+    small_code = "int small_a = 1;"
+    large_code = "int large_a = 1;\n" * (code_to_srcml._SRCML_CACHE_MAX_INPUT_LENGTH // 10)
+    cache = code_to_srcml._SrcmlCaller._cache_code_to_srcml
+    code_to_srcml.code_to_srcml(small_code)
+    code_to_srcml.code_to_srcml(large_code)
+    cached_codes = [cache_key[1] for cache_key in cache.keys()]
+    assert small_code in cached_codes
+    assert large_code not in cached_codes
+
+
+def _clear_srcml_calls_caches() -> None:
+    code_to_srcml._SrcmlCaller._cache_code_to_srcml.clear()
+    code_to_srcml._SrcmlCaller._cache_srcml_to_code.clear()
+
+
+def test_srcml_to_code_batch():
+    def exprs_of(code: str) -> list[ET.Element]:
+        element = code_to_srcml.code_to_srcml(code, dump_positions=False)
+        return [child for child in element.iter() if srcml_utils.clean_tag_or_attrib(child.tag) == "expr"]
+
+    # Exprs with comments or escaped control characters: they cannot be reconstructed from their texts,
+    # and are the ones which are converted by batch
+    exprs = exprs_of("int b[] = {1 /*x*/ + 2, 3 /*y*/ * 4};") + exprs_of('const char* s[] = {"a\x01b", "c\x02d"};')
+    assert all(srcml_utils.code_from_element_texts(expr) is None for expr in exprs)
+    expected_codes = [
+        "{1 /*x*/ + 2, 3 /*y*/ * 4}",
+        "1 /*x*/ + 2, ",
+        "3 /*y*/ * 4}",
+        '{"a\x01b", "c\x02d"}',
+        '"a\x01b", ',
+        '"c\x02d"}',
+    ]
+
+    # The caches are cleared, so that the batch results are not reused by the one by one conversions
+    _clear_srcml_calls_caches()
+    codes_batch = code_to_srcml.srcml_to_code_batch(exprs)
+    _clear_srcml_calls_caches()
+    codes_one_by_one = [code_to_srcml.srcml_to_code(expr) for expr in exprs]
+    assert codes_batch == expected_codes
+    assert codes_one_by_one == expected_codes
+
+
+@pytest.mark.skipif(shutil.which("srcml") is None, reason="the srcml executable is not installed")
+def test_srcml_subprocess_round_trip():
+    # The subprocess path is called directly: the public functions use the srcml_caller module when it is installed
+    code = 'int a = 1 << 20; // é\nvoid foo(const char* s = "a");\n'
+    srcml_caller = code_to_srcml._SRCML_CALLER
+    for dump_positions in (True, False):
+        xml_bytes = srcml_caller._make_xml_bytes_by_subprocess("utf-8", code, dump_positions)
+        element = ET.fromstring(xml_bytes)
+        assert srcml_utils.clean_tag_or_attrib(element.tag) == "unit"
+        assert srcml_caller._make_cpp_str_by_subprocess(xml_bytes, "utf-8") == code
+
+
+def test_srcml_call_subprocess_logs_stderr_on_success(caplog):
+    """Checks only the logging of _call_subprocess: the command is a shell which writes to stderr, not srcml"""
+    if shutil.which("sh") is None:
+        pytest.skip("sh is not available")
+    args = ["sh", "-c", "echo 'some srcml warning' >&2; cat"]
+    with caplog.at_level(logging.WARNING):
+        output = code_to_srcml._SRCML_CALLER._call_subprocess(args, b"int a;")
+    assert output == b"int a;"
+    assert "some srcml warning" in caplog.text
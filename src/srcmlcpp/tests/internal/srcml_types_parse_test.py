@@ -209,6 +209,21 @@ def test_parse_struct():
     code_utils.assert_are_codes_equal(cpp_element_str, expected_code)
 
 
+def test_parse_initial_values():
+    code = """
+    int a{1};
+    int b = -1;
+    bool c = true;
+    std::string d = std::string();
+    void* e = nullptr;
+    int f[2] = {1, 2};
+    """
+    options = srcmlcpp.SrcmlcppOptions()
+    cpp_unit = srcmlcpp.code_to_cpp_unit(options, code)
+    initial_values = [decl.initial_value_code for decl in cpp_unit.all_decl_recursive()]
+    assert initial_values == ["{1}", "-1", "true", "std::string()", "nullptr", "{1, 2}"]
+
+
 def test_parse_unit():
     options = SrcmlcppOptions()
     options.header_filter_preprocessor_regions = True
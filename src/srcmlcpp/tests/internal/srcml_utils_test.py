@@ -68,3 +68,46 @@ private:
 """
 
     code_utils.assert_are_codes_equal(code_info, expected_code_info)
+
+
+def test_code_from_element_texts():
+    code = "std::map<std::string, std::vector<int>> m = f(1 << 20, \"a\");"
+    code_xml = code_to_srcml.code_to_srcml(code)
+    for element in code_xml.iter():
+        code_from_texts = srcmlcpp.internal.srcml_utils.code_from_element_texts(element)
+        assert code_from_texts == code_to_srcml.srcml_to_code(element)
+
+    code_xml_with_comment = code_to_srcml.code_to_srcml("int /* comment */ a;")
+    assert srcmlcpp.internal.srcml_utils.code_from_element_texts(code_xml_with_comment) is None
+
+
+def test_clean_tag_or_attrib():
+    clean_tag_or_attrib = srcmlcpp.internal.srcml_utils.clean_tag_or_attrib
+    assert clean_tag_or_attrib("{http://www.srcML.org/srcML/src}decl_stmt") == "decl_stmt"
+    assert clean_tag_or_attrib("{http://www.srcML.org/srcML/position}start") == "start"
+    assert clean_tag_or_attrib("ns0:decl_stmt") == "decl_stmt"
+    assert clean_tag_or_attrib("ns1:start") == "start"
+    assert clean_tag_or_attrib("decl_stmt") == "decl_stmt"
+    # the cleaned tags are interned
+    assert clean_tag_or_attrib("{http://www.srcML.org/srcML/src}expr_stmt") is sys.intern("expr_stmt")
+
+
+def test_children_by_tag():
+    code_xml = code_to_srcml.code_to_srcml("int a = 1;")
+    srcml_utils = srcmlcpp.internal.srcml_utils
+    decl = next(element for element in code_xml.iter() if srcml_utils.clean_tag_or_attrib(element.tag) == "decl")
+    children_by_tag = srcml_utils.children_by_tag(decl)
+    assert list(children_by_tag.keys()) == ["type", "name", "init"]
+    for tag, children in children_by_tag.items():
+        assert children == srcml_utils.children_with_tag(decl, tag)
+
+
+def test_srcml_write_to_file(tmp_path):
+    from xml.etree import ElementTree as ET
+
+    code_xml = code_to_srcml.code_to_srcml("int a = 1; // é")
+    filename = os.path.join(str(tmp_path), "a.xml")
+    srcmlcpp.internal.srcml_utils.srcml_write_to_file("utf-8", code_xml, filename)
+    # (the file is read in text mode: it is written with the platform line endings)
+    with open(filename, encoding="utf-8") as f:
+        assert f.read() == ET.tostring(code_xml, encoding="utf-8").decode("utf-8")
@@ -0,0 +1,57 @@
+from __future__ import annotations
+import os
+
+import pytest
+
+import srcmlcpp
+from srcmlcpp.internal import code_cache
+from srcmlcpp.srcmlcpp_exception import SrcmlcppException
+
+
+def test_files_to_cpp_units(tmp_path):
+    codes = ["int a = 1;\n", "// doc\nvoid foo(int x);\n", "struct Foo { int v; };\n"]
+    filenames = []
+    for i, code in enumerate(codes):
+        filename = os.path.join(str(tmp_path), f"file_{i}.h")
+        with open(filename, "w") as f:
+            f.write(code)
+        filenames.append(filename)
+
+    options = srcmlcpp.SrcmlcppOptions()
+    cpp_units = srcmlcpp.files_to_cpp_units(options, filenames, nb_workers=2)
+    # The files were read by the workers: their code is stored in the code cache of the main process
+    # (checked before the sequential run, which would also fill it)
+    for filename, code in zip(filenames, codes):
+        assert code_cache.get_cached_code(filename) == code
+
+    cpp_units_sequential = srcmlcpp.files_to_cpp_units(options, filenames, nb_workers=1)
+    assert len(cpp_units) == len(codes)
+    for cpp_unit, cpp_unit_sequential, filename in zip(cpp_units, cpp_units_sequential, filenames):
+        assert cpp_unit.filename == filename
+        assert cpp_unit.str_code() == cpp_unit_sequential.str_code()
+
+
+def _preprocess_fail_on_marker(code: str) -> str:
+    # (module level function: the options are sent to the worker processes)
+    if "FAIL_HERE" in code:
+        cpp_unit = srcmlcpp.code_to_cpp_unit(srcmlcpp.SrcmlcppOptions(), code)
+        cpp_unit.block_children[0].raise_exception("Artificial parse error")
+    return code
+
+
+def test_files_to_cpp_units_parse_error(tmp_path):
+    codes = ["int a = 1;\n", "int FAIL_HERE = 2;\n", "int c = 3;\n"]
+    filenames = []
+    for i, code in enumerate(codes):
+        filename = os.path.join(str(tmp_path), f"file_{i}.h")
+        with open(filename, "w") as f:
+            f.write(code)
+        filenames.append(filename)
+
+    options = srcmlcpp.SrcmlcppOptions()
+    options.code_preprocess_function = _preprocess_fail_on_marker
+    with pytest.raises(SrcmlcppException) as exc_info:
+        srcmlcpp.files_to_cpp_units(options, filenames, nb_workers=2)
+    message = str(exc_info.value)
+    assert "Artificial parse error" in message
+    assert "int FAIL_HERE = 2;" in message